@@ -1,9 +1,25 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import requests
 import json
 import os
+import sys
+import time
+import random
+import uuid
+import functools
+import itertools
+import re
 import logging
+import threading
+import queue
+import atexit
+import sqlite3
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Configure logging
@@ -12,70 +28,853 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    http_compression=os.getenv('SOCKETIO_HTTP_COMPRESSION', 'True').lower() == 'true',
+    compression_threshold=int(os.getenv('SOCKETIO_COMPRESSION_THRESHOLD', 1024))
+)
+
+def format_clock(epoch):
+    """Format an epoch timestamp as HH:MM:SS for display"""
+    return datetime.fromtimestamp(epoch).strftime('%H:%M:%S')
+
+class User:
+    """Connected user; username, language and room strings are interned"""
+    __slots__ = ('username', 'language', 'room', 'joined_at', 'compact')
+
+    def __init__(self, username, language, room, compact=False):
+        self.username = sys.intern(username)
+        self.language = sys.intern(language)
+        self.room = sys.intern(room)
+        self.joined_at = time.time()
+        self.compact = compact
+
+class Message:
+    """Stored chat message with a monotonic integer id and an epoch timestamp.
+
+    Strings shared between messages are interned and timestamps are only
+    formatted when a message leaves the server (see to_dict).
+    """
+    __slots__ = ('id', 'username', 'content', 'language', 'room', 'created')
+
+    def __init__(self, username, content, language, room):
+        self.id = next(message_ids)
+        self.username = sys.intern(username)
+        self.content = content
+        self.language = sys.intern(language)
+        self.room = sys.intern(room)
+        self.created = time.time()
+
+    @property
+    def timestamp(self):
+        return format_clock(self.created)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'username': self.username,
+            'content': self.content,
+            'original_language': self.language,
+            'room': self.room,
+            'timestamp': self.timestamp,
+            'created_at': datetime.fromtimestamp(self.created).isoformat()
+        }
 
 # In-memory storage for users and messages
 users = {}
 messages = []
 rooms = {}
+message_ids = itertools.count(1)
+
+# Compact Socket.IO encoding, used for clients that ask for it in join_chat
+COMPACT_WIRE = os.getenv('COMPACT_WIRE', 'True').lower() == 'true'
+LANGUAGE_CODES = {
+    'english': 'en',
+    'hindi': 'hi',
+    'spanish': 'es',
+    'french': 'fr',
+    'german': 'de',
+    'chinese': 'zh',
+    'japanese': 'ja',
+    'korean': 'ko'
+}
+LANGUAGE_NAMES = {code: name for name, code in LANGUAGE_CODES.items()}
+
+# Optional per-room coalescing of outgoing messages into batch frames
+COALESCE_MESSAGES = os.getenv('COALESCE_MESSAGES', 'False').lower() == 'true'
+COALESCE_MAX_DELAY_MS = int(os.getenv('COALESCE_MAX_DELAY_MS', 10))
+COALESCE_MAX_BATCH = int(os.getenv('COALESCE_MAX_BATCH', 50))
+
+# Request tracing (off by default, can be toggled at runtime via /api/admin/tracing)
+TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'False').lower() == 'true'
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 1.0))
+TRACE_LOG_PATH = os.getenv('TRACE_LOG_PATH', 'traces.jsonl')
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
 
 # Ollama configuration with environment variables
 OLLAMA_URL = os.getenv('OLLAMA_URL', 'http://localhost:11434/api/generate')
 OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'gemma3:4b')
+OLLAMA_KEEP_ALIVE = os.getenv('OLLAMA_KEEP_ALIVE', '10m')
+OLLAMA_WARMUP = os.getenv('OLLAMA_WARMUP', 'True').lower() == 'true'
+OLLAMA_HEARTBEAT_INTERVAL = int(os.getenv('OLLAMA_HEARTBEAT_INTERVAL', 240))
+
+# Translation backend: 'ollama' (routed over OLLAMA_URLS) or 'stub' for tests/benchmarks
+TRANSLATION_BACKEND = os.getenv('TRANSLATION_BACKEND', 'ollama').lower()
+OLLAMA_URLS = [url.strip() for url in os.getenv('OLLAMA_URLS', OLLAMA_URL).split(',') if url.strip()]
+ROUTING_STRATEGY = os.getenv('ROUTING_STRATEGY', 'least_outstanding')  # or 'latency'
+BACKEND_EJECT_FAILURES = int(os.getenv('BACKEND_EJECT_FAILURES', 3))
+BACKEND_EJECT_SECONDS = int(os.getenv('BACKEND_EJECT_SECONDS', 30))
+
+# Translation cache and batch translation limits
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', 2048))
+BATCH_MAX_TEXTS = int(os.getenv('BATCH_MAX_TEXTS', 100))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 4))
+
+# Optional on-disk translation cache (disabled when no path is set)
+TRANSLATION_CACHE_PATH = os.getenv('TRANSLATION_CACHE_PATH', '')
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', 100000))
+TRANSLATION_PREWARM_FILE = os.getenv('TRANSLATION_PREWARM_FILE', '')
+TRANSLATION_PREWARM_SOURCE = os.getenv('TRANSLATION_PREWARM_SOURCE', 'english')
+
+# A request whose load_duration exceeds this paid for loading the model
+COLD_LOAD_THRESHOLD_MS = 100
+
+# Model residency and cold-start vs warm latency tracking
+model_state = {
+    'warmed_at': None,
+    'last_used': None,
+    'cold_requests': 0,
+    'cold_latency_ms_total': 0.0,
+    'last_cold_start_ms': None,
+    'warm_requests': 0,
+    'warm_latency_ms_total': 0.0,
+    'last_warm_latency_ms': None,
+    'warmups': 0,
+    'last_warmup_ms': None,
+    'heartbeats': 0
+}
+model_state_lock = threading.Lock()
+
+class _NoopSpan:
+    """Returned when tracing is off or the request was not sampled"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+class _Span:
+    def __init__(self, tracer, trace, name, attrs):
+        self.tracer = tracer
+        self.trace = trace
+        self.record = {'name': name, **attrs}
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.record['start_ms'] = round((self.started - self.trace['started']) * 1000, 3)
+        self.tracer._local.stack.append(self.record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record['duration_ms'] = round((time.perf_counter() - self.started) * 1000, 3)
+        if exc_type is not None:
+            self.record['error'] = exc_type.__name__
+        self.tracer._local.stack.pop()
+        self.trace['spans'].append(self.record)
+        return False
+
+class Tracer:
+    """Opt-in sampled request tracing written as JSON lines to a local log.
+
+    Handlers decorated with trace() start a trace for a sampled fraction of
+    calls; span() and spanned() time stages inside it on the same thread.
+    When tracing is off every entry point returns before doing any work.
+    """
+
+    def __init__(self, log_path, sample_rate=1.0, enabled=False):
+        self.log_path = log_path
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self.traces_written = 0
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def _current(self):
+        return getattr(self._local, 'trace', None)
+
+    def trace(self, name):
+        """Decorator starting a trace around a handler"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self._current() is not None or random.random() >= self.sample_rate:
+                    return func(*args, **kwargs)
+                trace = {
+                    'trace_id': uuid.uuid4().hex[:16],
+                    'name': name,
+                    'timestamp': datetime.now().isoformat(),
+                    'started': time.perf_counter(),
+                    'spans': []
+                }
+                self._local.trace = trace
+                self._local.stack = [trace]
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._local.trace = None
+                    self._local.stack = []
+                    trace['duration_ms'] = round((time.perf_counter() - trace.pop('started')) * 1000, 3)
+                    self._write(trace)
+            return wrapper
+        return decorator
+
+    def span(self, name, **attrs):
+        """Context manager timing one stage of the current trace"""
+        if not self.enabled:
+            return NOOP_SPAN
+        trace = self._current()
+        if trace is None:
+            return NOOP_SPAN
+        return _Span(self, trace, name, attrs)
+
+    def spanned(self, name):
+        """Decorator timing every call of a function as a span"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def sampled(self):
+        """Whether the calling thread is inside a sampled trace"""
+        return self.enabled and self._current() is not None
+
+    def annotate(self, **attrs):
+        """Attach attributes to the innermost open span (or the trace itself)"""
+        if self.enabled and self._current() is not None:
+            self._local.stack[-1].update(attrs)
+
+    def _write(self, trace):
+        try:
+            line = json.dumps(trace, ensure_ascii=False, default=str)
+            with self._write_lock:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                self.traces_written += 1
+        except Exception as e:
+            logger.error(f"Failed to write trace: {e}")
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'log_path': self.log_path,
+            'traces_written': self.traces_written
+        }
+
+tracer = Tracer(TRACE_LOG_PATH, sample_rate=TRACE_SAMPLE_RATE, enabled=TRACE_ENABLED)
 
 def test_ollama_connection():
-    """Test if Ollama is running and accessible"""
+    """Test if the configured Ollama endpoints are running and accessible"""
+    available = False
+    for url in OLLAMA_URLS:
+        try:
+            response = requests.get(url.replace('/api/generate', '/api/tags'), timeout=5)
+            if response.status_code == 200:
+                models = response.json()
+                print(f"✅ Ollama is running at {url}. Available models: {[model['name'] for model in models.get('models', [])]}")
+                available = True
+            else:
+                print(f"❌ Ollama at {url} responded with status {response.status_code}")
+        except Exception as e:
+            print(f"❌ Failed to connect to Ollama at {url}: {e}")
+    return available
+
+def parse_keep_alive(value):
+    """Convert an Ollama keep_alive value ('10m', '1h30m', '300') to seconds; None means forever"""
+    value = str(value).strip()
     try:
-        response = requests.get('http://localhost:11434/api/tags', timeout=5)
-        if response.status_code == 200:
-            models = response.json()
-            print(f"✅ Ollama is running. Available models: {[model['name'] for model in models.get('models', [])]}")
-            return True
-        else:
-            print(f"❌ Ollama responded with status {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Failed to connect to Ollama: {e}")
+        seconds = float(value)
+    except ValueError:
+        units = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+        parts = re.findall(r'(-?\d+(?:\.\d+)?)(ms|h|m|s)', value)
+        if not parts or ''.join(number + unit for number, unit in parts) != value:
+            logger.warning(f"Cannot parse OLLAMA_KEEP_ALIVE={value!r}, assuming Ollama's 5m default")
+            return 300.0
+        seconds = sum(float(number) * units[unit] for number, unit in parts)
+    return None if seconds < 0 else seconds
+
+OLLAMA_KEEP_ALIVE_SECONDS = parse_keep_alive(OLLAMA_KEEP_ALIVE)
+
+# An endpoint can sit idle for almost two heartbeat intervals before it is pinged,
+# so the interval has to stay within half of keep_alive for the model to stay loaded
+if OLLAMA_KEEP_ALIVE_SECONDS is not None and OLLAMA_HEARTBEAT_INTERVAL > OLLAMA_KEEP_ALIVE_SECONDS / 2:
+    logger.warning(f"OLLAMA_HEARTBEAT_INTERVAL={OLLAMA_HEARTBEAT_INTERVAL}s is too close to "
+                   f"OLLAMA_KEEP_ALIVE={OLLAMA_KEEP_ALIVE}, using {int(OLLAMA_KEEP_ALIVE_SECONDS // 2)}s")
+    OLLAMA_HEARTBEAT_INTERVAL = int(OLLAMA_KEEP_ALIVE_SECONDS // 2)
+
+def is_resident(last_used):
+    """Whether a model last used at `last_used` (epoch) is still loaded under keep_alive"""
+    if not last_used:
         return False
+    return OLLAMA_KEEP_ALIVE_SECONDS is None or time.time() - last_used < OLLAMA_KEEP_ALIVE_SECONDS
 
-def translate_text(text, target_language, source_language="auto"):
-    """Translate text using Ollama with enhanced error handling"""
-    if not text or not text.strip():
-        return text
-        
-    # If target and source are the same, no translation needed
-    if source_language == target_language:
-        return text
-        
-    try:
-        prompt = f"""Translate the following text from {source_language} to {target_language}. 
+def record_model_latency(latency_ms, load_ms):
+    """Record a completed translation call as either a cold start or a warm request"""
+    with model_state_lock:
+        model_state['last_used'] = time.time()
+        if load_ms >= COLD_LOAD_THRESHOLD_MS:
+            model_state['cold_requests'] += 1
+            model_state['cold_latency_ms_total'] += latency_ms
+            model_state['last_cold_start_ms'] = round(latency_ms, 1)
+        else:
+            model_state['warm_requests'] += 1
+            model_state['warm_latency_ms_total'] += latency_ms
+            model_state['last_warm_latency_ms'] = round(latency_ms, 1)
+
+def record_model_warmup(latency_ms):
+    """Record a warm-up or heartbeat call; kept out of the translation latency stats"""
+    with model_state_lock:
+        model_state['last_used'] = time.time()
+        model_state['warmups'] += 1
+        model_state['last_warmup_ms'] = round(latency_ms, 1)
+
+def get_model_metrics():
+    """Summarize model residency and cold/warm latency for metrics and health"""
+    with model_state_lock:
+        state = dict(model_state)
+    cold, warm = state['cold_requests'], state['warm_requests']
+    idle = time.time() - state['last_used'] if state['last_used'] else None
+    return {
+        'model': translation_backend.model,
+        'keep_alive': OLLAMA_KEEP_ALIVE,
+        'warm': translation_backend.is_warm(),
+        'warmed_at': datetime.fromtimestamp(state['warmed_at']).isoformat() if state['warmed_at'] else None,
+        'idle_seconds': round(idle, 1) if idle is not None else None,
+        'heartbeats': state['heartbeats'],
+        'warm_up': {
+            'count': state['warmups'],
+            'last_ms': state['last_warmup_ms']
+        },
+        'cold_start': {
+            'count': cold,
+            'avg_ms': round(state['cold_latency_ms_total'] / cold, 1) if cold else None,
+            'last_ms': state['last_cold_start_ms']
+        },
+        'warm_latency': {
+            'count': warm,
+            'avg_ms': round(state['warm_latency_ms_total'] / warm, 1) if warm else None,
+            'last_ms': state['last_warm_latency_ms']
+        }
+    }
+
+class TranslationBackendError(Exception):
+    """Raised when a backend answers but cannot produce a translation"""
+
+def build_translation_prompt(text, target_language, source_language):
+    """Prompt used by LLM backends to translate a single text"""
+    return f"""Translate the following text from {source_language} to {target_language}. 
 Only return the translated text, nothing else.
 
 Text to translate: {text}
 
 Translation:"""
 
+class TranslationBackend(ABC):
+    """Interface implemented by every translation backend"""
+    name = 'backend'
+    model = None
+
+    @abstractmethod
+    def translate(self, text, target_language, source_language):
+        """Return the translated text; raise on transport or backend errors"""
+
+    def warm_up(self):
+        """Load the model ahead of the first request; return True on success"""
+        return True
+
+    def keep_warm(self, max_idle):
+        """Ping the model wherever it has been idle for max_idle seconds; return the number of pings"""
+        return 0
+
+    def is_warm(self):
+        """Whether the model is currently loaded and a request would not pay a cold start"""
+        return True
+
+    def is_available(self):
+        return True
+
+    def describe(self):
+        return {'name': self.name, 'model': self.model}
+
+class OllamaBackend(TranslationBackend):
+    """Translation through a single Ollama /api/generate endpoint"""
+    name = 'ollama'
+
+    def __init__(self, url, model):
+        self.url = url
+        self.model = model
+
+    def _generate(self, payload, timeout):
+        # Only sampled requests stream, so the first NDJSON chunk can mark the first generated token (TTFB)
+        stream = tracer.sampled()
+        with tracer.span('ollama', url=self.url):
+            started = time.perf_counter()
+            with requests.post(self.url, json=dict(payload, stream=stream), timeout=timeout, stream=stream) as response:
+                tracer.annotate(headers_ms=round((time.perf_counter() - started) * 1000, 3),
+                                status=response.status_code)
+                if response.status_code != 200:
+                    raise TranslationBackendError(f"Ollama API error ({self.url}): {response.status_code} - {response.text}")
+                if stream:
+                    result = self._read_stream(response, started)
+                else:
+                    result = response.json()
+                    if 'error' in result:
+                        raise TranslationBackendError(f"Ollama API error ({self.url}): {result['error']}")
+            latency_ms = (time.perf_counter() - started) * 1000
+            tracer.annotate(total_ms=round(latency_ms, 3))
+            return result, latency_ms
+
+    def _read_stream(self, response, started):
+        pieces = []
+        result = {}
+        for line in response.iter_lines(chunk_size=None):
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if 'error' in chunk:
+                raise TranslationBackendError(f"Ollama API error ({self.url}): {chunk['error']}")
+            if not pieces:
+                tracer.annotate(ttfb_ms=round((time.perf_counter() - started) * 1000, 3))
+            pieces.append(chunk.get('response', ''))
+            if chunk.get('done'):
+                result = chunk
+        result['response'] = ''.join(pieces)
+        return result
+
+    def translate(self, text, target_language, source_language):
+        payload = {
+            "model": self.model,
+            "prompt": build_translation_prompt(text, target_language, source_language),
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE
+        }
+        result, latency_ms = self._generate(payload, timeout=30)
+        record_model_latency(latency_ms, result.get('load_duration', 0) / 1e6)
+        return result.get('response', '').strip()
+
+    def warm_up(self):
         payload = {
-            "model": OLLAMA_MODEL,
-            "prompt": prompt,
-            "stream": False
+            "model": self.model,
+            "prompt": "Hi",
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {"num_predict": 1}
+        }
+        try:
+            _, latency_ms = self._generate(payload, timeout=120)
+            record_model_warmup(latency_ms)
+            logger.info(f"Model {self.model} warm on {self.url} ({latency_ms:.0f} ms)")
+            return True
+        except Exception as e:
+            logger.warning(f"Model warm-up failed on {self.url}: {e}")
+            return False
+
+    def is_available(self):
+        try:
+            response = requests.get(self.url.replace('/api/generate', '/api/tags'), timeout=5)
+            return response.status_code == 200
+        except:
+            return False
+
+    def describe(self):
+        return {'name': self.name, 'model': self.model, 'url': self.url}
+
+class StubBackend(TranslationBackend):
+    """Deterministic local backend for tests and benchmarks (no model server)"""
+    name = 'stub'
+    model = 'stub'
+
+    def __init__(self, latency_ms=0):
+        self.latency_ms = latency_ms
+
+    def translate(self, text, target_language, source_language):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return f"[{target_language}] {text}"
+
+class BackendRouter(TranslationBackend):
+    """Spread requests over several backends with health-based ejection.
+
+    Strategies:
+    - least_outstanding: pick the backend with the fewest in-flight requests
+    - latency: pick the lowest EWMA latency weighted by in-flight requests
+    A backend failing BACKEND_EJECT_FAILURES times in a row is skipped for
+    BACKEND_EJECT_SECONDS; if every backend is ejected, all are tried again.
+    """
+    name = 'router'
+
+    def __init__(self, backends, strategy='least_outstanding'):
+        self.backends = backends
+        self.strategy = strategy
+        self.model = backends[0].model
+        self.lock = threading.Lock()
+        self.stats = [{
+            'outstanding': 0,
+            'ewma_ms': None,
+            'requests': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'ejected_until': 0.0,
+            'last_used': 0.0
+        } for _ in backends]
+
+    def _score(self, i):
+        stat = self.stats[i]
+        if self.strategy == 'latency':
+            # Unmeasured backends score 0 so each one gets probed
+            return ((stat['ewma_ms'] or 0.0) * (stat['outstanding'] + 1), stat['requests'])
+        return (stat['outstanding'], stat['ewma_ms'] or 0.0, stat['requests'])
+
+    def _acquire(self, exclude):
+        """Pick a backend index and mark a request in flight on it"""
+        with self.lock:
+            now = time.time()
+            candidates = [i for i in range(len(self.backends))
+                          if i not in exclude and self.stats[i]['ejected_until'] <= now]
+            if not candidates:
+                candidates = [i for i in range(len(self.backends)) if i not in exclude]
+            if not candidates:
+                return None
+            index = min(candidates, key=self._score)
+            self.stats[index]['outstanding'] += 1
+            self.stats[index]['requests'] += 1
+            return index
+
+    def _release(self, index, latency_ms=None, failed=False):
+        with self.lock:
+            stat = self.stats[index]
+            stat['outstanding'] -= 1
+            if failed:
+                stat['failures'] += 1
+                stat['consecutive_failures'] += 1
+                if stat['consecutive_failures'] >= BACKEND_EJECT_FAILURES:
+                    stat['ejected_until'] = time.time() + BACKEND_EJECT_SECONDS
+                    logger.warning(f"Ejecting translation backend {index} for {BACKEND_EJECT_SECONDS}s "
+                                   f"after {stat['consecutive_failures']} failures")
+            else:
+                stat['consecutive_failures'] = 0
+                stat['ejected_until'] = 0.0
+                stat['last_used'] = time.time()
+                if stat['ewma_ms'] is None:
+                    stat['ewma_ms'] = latency_ms
+                else:
+                    stat['ewma_ms'] = 0.8 * stat['ewma_ms'] + 0.2 * latency_ms
+
+    def translate(self, text, target_language, source_language):
+        tried = set()
+        while True:
+            index = self._acquire(tried)
+            tried.add(index)
+            started = time.perf_counter()
+            try:
+                translation = self.backends[index].translate(text, target_language, source_language)
+            except requests.exceptions.ConnectionError:
+                self._release(index, failed=True)
+                # Nothing was sent, so another endpoint can safely take the request
+                if len(tried) < len(self.backends):
+                    continue
+                raise
+            except Exception:
+                self._release(index, failed=True)
+                raise
+            self._release(index, latency_ms=(time.perf_counter() - started) * 1000)
+            return translation
+
+    def _warm_up_backend(self, index):
+        if not self.backends[index].warm_up():
+            return False
+        with self.lock:
+            self.stats[index]['last_used'] = time.time()
+        return True
+
+    def warm_up(self):
+        return any([self._warm_up_backend(i) for i in range(len(self.backends))])
+
+    def keep_warm(self, max_idle):
+        # Sequential traffic can favour one endpoint, so residency is tracked per endpoint
+        now = time.time()
+        with self.lock:
+            idle = [i for i, stat in enumerate(self.stats)
+                    if stat['ejected_until'] <= now and now - stat['last_used'] >= max_idle]
+        return sum(1 for i in idle if self._warm_up_backend(i))
+
+    def is_warm(self):
+        now = time.time()
+        with self.lock:
+            healthy = [stat['last_used'] for stat in self.stats if stat['ejected_until'] <= now]
+        return bool(healthy) and all(is_resident(last_used) for last_used in healthy)
+
+    def is_available(self):
+        return any(backend.is_available() for backend in self.backends)
+
+    def describe(self):
+        now = time.time()
+        with self.lock:
+            stats = [dict(stat) for stat in self.stats]
+        return {
+            'name': self.name,
+            'model': self.model,
+            'strategy': self.strategy,
+            'backends': [dict(backend.describe(),
+                              outstanding=stat['outstanding'],
+                              ewma_ms=round(stat['ewma_ms'], 1) if stat['ewma_ms'] is not None else None,
+                              requests=stat['requests'],
+                              failures=stat['failures'],
+                              ejected=stat['ejected_until'] > now,
+                              warm=is_resident(stat['last_used']),
+                              idle_seconds=round(now - stat['last_used'], 1) if stat['last_used'] else None)
+                         for backend, stat in zip(self.backends, stats)]
         }
+
+def create_translation_backend():
+    """Build the configured translation backend"""
+    if TRANSLATION_BACKEND == 'stub':
+        return StubBackend(latency_ms=int(os.getenv('STUB_LATENCY_MS', 0)))
+    return BackendRouter([OllamaBackend(url, OLLAMA_MODEL) for url in OLLAMA_URLS],
+                         strategy=ROUTING_STRATEGY)
+
+translation_backend = create_translation_backend()
+
+def warm_up_model():
+    """Preload the model on every endpoint so the first translation is warm"""
+    if not translation_backend.warm_up():
+        return False
+    with model_state_lock:
+        model_state['warmed_at'] = time.time()
+    return True
+
+def model_heartbeat_loop():
+    """Keep the model resident on every endpoint while rooms are active by pinging idle ones"""
+    while True:
+        socketio.sleep(OLLAMA_HEARTBEAT_INTERVAL)
+        if not users:
+            continue
+        pinged = translation_backend.keep_warm(OLLAMA_HEARTBEAT_INTERVAL)
+        if pinged:
+            with model_state_lock:
+                model_state['heartbeats'] += pinged
+
+# LRU cache of successful translations keyed by (text, source, target, model)
+translation_cache = OrderedDict()
+translation_cache_lock = threading.Lock()
+
+class PersistentTranslationCache:
+    """SQLite-backed translation cache that survives restarts.
+
+    The database is opened on first use. Lookups go through their own
+    connection, which WAL mode lets run alongside the writer. New entries
+    and last-used updates are queued and written back by a daemon thread
+    with a second connection. A running row count drives least-recently-
+    used eviction past max_entries, and every entry is dropped when the
+    stored model name differs from the active one.
+    """
+
+    def __init__(self, path, model, max_entries):
+        self.path = path
+        self.model = model
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._rows = 0
+        self._read_conn = None
+        self._write_conn = None
+        self._open_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._writer = None
+
+    @staticmethod
+    def make_key(text, source_language, target_language, model):
+        return hashlib.sha256('\0'.join((text, source_language, target_language, model)).encode('utf-8')).hexdigest()
+
+    def _open(self):
+        with self._open_lock:
+            if self._read_conn is not None:
+                return
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS translations "
+                             "(key TEXT PRIMARY KEY, translation TEXT NOT NULL, last_used REAL NOT NULL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                row = conn.execute("SELECT value FROM meta WHERE name = 'model'").fetchone()
+                if row is None or row[0] != self.model:
+                    if row is not None:
+                        logger.info(f"Translation cache model changed ({row[0]} -> {self.model}), clearing {self.path}")
+                    conn.execute("DELETE FROM translations")
+                    conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('model', ?)", (self.model,))
+                conn.commit()
+                rows = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                read_conn = sqlite3.connect(self.path, check_same_thread=False)
+            except Exception:
+                conn.close()
+                raise
+            # Only start the writer once both connections exist, so a failed open leaves nothing behind
+            self._rows = rows
+            self._write_conn = conn
+            self._read_conn = read_conn
+            self._writer = threading.Thread(target=self._write_loop, name='translation-cache-writer', daemon=True)
+            self._writer.start()
+            logger.info(f"Persistent translation cache opened at {self.path} ({self._rows} entries)")
+
+    def get(self, text, target_language, source_language):
+        if self._read_conn is None:
+            self._open()
+        key = self.make_key(text, source_language, target_language, self.model)
+        with self._read_lock:
+            row = self._read_conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._pending.put((key, None, time.time()))
+        return row[0]
+
+    def put(self, text, target_language, source_language, translation):
+        if self._read_conn is None:
+            self._open()
+        key = self.make_key(text, source_language, target_language, self.model)
+        self._pending.put((key, translation, time.time()))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error(f"Translation cache write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    def _write(self, batch):
+        """Runs on the writer thread only, which owns the write connection"""
+        conn = self._write_conn
+        inserts = [(key, translation, used) for key, translation, used in batch if translation is not None]
+        touches = [(used, key) for key, translation, used in batch if translation is None]
+        # Keep the first stored translation so the row count only grows for new keys
+        self._rows += conn.executemany("INSERT OR IGNORE INTO translations (key, translation, last_used) "
+                                       "VALUES (?, ?, ?)", inserts).rowcount
+        conn.executemany("UPDATE translations SET last_used = ? WHERE key = ?", touches)
+        excess = self._rows - self.max_entries
+        if excess > 0:
+            self._rows -= conn.execute("DELETE FROM translations WHERE key IN "
+                                       "(SELECT key FROM translations ORDER BY last_used LIMIT ?)", (excess,)).rowcount
+        conn.commit()
+
+    def flush(self):
+        """Block until queued writes are on disk"""
+        if self._writer is not None:
+            self._pending.join()
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'model': self.model,
+            'entries': self._rows if self._read_conn is not None else None,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'pending_writes': self._pending.qsize()
+        }
+
+persistent_cache = (PersistentTranslationCache(TRANSLATION_CACHE_PATH, translation_backend.model,
+                                               TRANSLATION_CACHE_MAX_ENTRIES)
+                    if TRANSLATION_CACHE_PATH else None)
+if persistent_cache is not None:
+    atexit.register(persistent_cache.flush)
+
+def _remember_translation(key, translation):
+    if TRANSLATION_CACHE_SIZE <= 0:
+        return
+    with translation_cache_lock:
+        translation_cache[key] = translation
+        translation_cache.move_to_end(key)
+        while len(translation_cache) > TRANSLATION_CACHE_SIZE:
+            translation_cache.popitem(last=False)
+
+def get_cached_translation(text, target_language, source_language="auto"):
+    """Return a cached translation from memory or disk, or None"""
+    key = (text, source_language, target_language, translation_backend.model)
+    with translation_cache_lock:
+        translation = translation_cache.get(key)
+        if translation is not None:
+            translation_cache.move_to_end(key)
+            return translation
+    if persistent_cache is None:
+        return None
+    try:
+        translation = persistent_cache.get(text, target_language, source_language)
+    except Exception as e:
+        logger.error(f"Translation cache read failed: {e}")
+        return None
+    if translation is not None:
+        _remember_translation(key, translation)
+    return translation
+
+def cache_translation(text, target_language, source_language, translation):
+    """Store a translation in memory (LRU) and queue it for the on-disk cache"""
+    _remember_translation((text, source_language, target_language, translation_backend.model), translation)
+    if persistent_cache is not None:
+        try:
+            persistent_cache.put(text, target_language, source_language, translation)
+        except Exception as e:
+            logger.error(f"Translation cache write failed: {e}")
+
+def needs_translation(text, target_language, source_language):
+    """Empty text and same-language pairs are returned unchanged"""
+    return bool(text and text.strip()) and source_language != target_language
+
+@tracer.spanned('translate_text')
+def translate_text(text, target_language, source_language="auto"):
+    """Translate text using the configured backend with enhanced error handling"""
+    if not needs_translation(text, target_language, source_language):
+        return text
         
-        response = requests.post(OLLAMA_URL, json=payload, timeout=30)
+    cached = get_cached_translation(text, target_language, source_language)
+    tracer.annotate(target_language=target_language, cache_hit=cached is not None)
+    if cached is not None:
+        return cached
         
-        if response.status_code == 200:
-            result = response.json()
-            translation = result.get('response', '').strip()
-            if translation:
-                logger.info(f"Translation successful: {source_language} -> {target_language}")
-                return translation
-            else:
-                logger.warning("Empty translation response, returning original text")
-                return text
+    return translate_uncached(text, target_language, source_language)
+
+def translate_uncached(text, target_language, source_language):
+    """Translate through the backend and cache the result; falls back to the original text"""
+    try:
+        translation = translation_backend.translate(text, target_language, source_language)
+        if translation:
+            logger.info(f"Translation successful: {source_language} -> {target_language}")
+            cache_translation(text, target_language, source_language, translation)
+            return translation
         else:
-            logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+            logger.warning("Empty translation response, returning original text")
             return text
             
+    except TranslationBackendError as e:
+        logger.error(str(e))
+        return text
     except requests.exceptions.ConnectionError:
         logger.warning("Translation service unavailable, returning original text")
         return text
@@ -86,6 +885,38 @@ Translation:"""
         logger.error(f"Translation error: {e}")
         return text
 
+def translate_many(pairs, source_language="auto"):
+    """Translate unique (text, target_language) pairs, yielding results as they finish.
+
+    Cache hits are yielded immediately; misses run concurrently (up to
+    BATCH_CONCURRENCY) so a router with several endpoints is kept busy.
+    """
+    misses = []
+    for text, target_language in pairs:
+        if not needs_translation(text, target_language, source_language):
+            yield (text, target_language), text
+            continue
+        cached = get_cached_translation(text, target_language, source_language)
+        if cached is not None:
+            yield (text, target_language), cached
+        else:
+            misses.append((text, target_language))
+    if not misses:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, min(BATCH_CONCURRENCY, len(misses))))
+    try:
+        futures = {executor.submit(translate_uncached, text, target_language, source_language): (text, target_language)
+                   for text, target_language in misses}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    except GeneratorExit:
+        # The consumer went away (e.g. a streaming client disconnected): drop the queued translations
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        # Every future has finished on the normal path, so there is nothing to wait for
+        executor.shutdown(wait=False)
+
 @app.route('/')
 def index():
     """Main chat interface endpoint - TC001"""
@@ -105,9 +936,50 @@ def health_check():
         'version': '1.0.0',
         'services': {
             'ollama': check_ollama_service()
-        }
+        },
+        'model': get_model_metrics()
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Translation model metrics (residency, cold-start and warm latency)"""
+    return jsonify({
+        'timestamp': datetime.now().isoformat(),
+        'translation': get_model_metrics(),
+        'backend': translation_backend.describe(),
+        'cache': {
+            'memory_entries': len(translation_cache),
+            'memory_max_entries': TRANSLATION_CACHE_SIZE,
+            'persistent': persistent_cache.stats() if persistent_cache is not None else None
+        },
+        'coalescing': dict(coalesce_stats, enabled=COALESCE_MESSAGES,
+                           max_delay_ms=COALESCE_MAX_DELAY_MS, max_batch=COALESCE_MAX_BATCH)
     })
 
+@app.route('/api/admin/tracing', methods=['GET', 'POST'])
+def admin_tracing():
+    """Inspect or toggle request tracing at runtime (requires ADMIN_TOKEN)"""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Not found'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({'error': 'Forbidden'}), 403
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        if 'sample_rate' in data:
+            try:
+                sample_rate = float(data['sample_rate'])
+            except (TypeError, ValueError):
+                return jsonify({'error': 'sample_rate must be a number'}), 400
+            if not 0.0 <= sample_rate <= 1.0:
+                return jsonify({'error': 'sample_rate must be between 0 and 1'}), 400
+            tracer.sample_rate = sample_rate
+        if 'enabled' in data:
+            tracer.enabled = bool(data['enabled'])
+        logger.info(f"Tracing {'enabled' if tracer.enabled else 'disabled'} (sample rate {tracer.sample_rate})")
+    return jsonify(tracer.status())
+
 @app.route('/api/translate', methods=['POST'])
 def api_translate():
     """REST API endpoint for translation - TC006"""
@@ -139,13 +1011,103 @@ def api_translate():
         logger.error(f"Translation API error: {e}")
         return jsonify({'error': 'Translation service error'}), 500
 
+def prewarm_translation_cache(path):
+    """Translate every phrase in a file (one per line) into all supported languages"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            phrases = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    except OSError as e:
+        logger.error(f"Cannot read prewarm phrase list {path}: {e}")
+        return
+    pairs = [(phrase, language) for phrase in dict.fromkeys(phrases)
+             for language in LANGUAGE_CODES if language != TRANSLATION_PREWARM_SOURCE]
+    started = time.perf_counter()
+    for _ in translate_many(pairs, TRANSLATION_PREWARM_SOURCE):
+        pass
+    logger.info(f"Prewarmed translation cache with {len(pairs)} translations "
+                f"in {time.perf_counter() - started:.1f}s")
+
+@app.route('/api/translate/batch', methods=['POST'])
+def api_translate_batch():
+    """REST API endpoint for translating many texts into several languages"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Invalid JSON data'}), 400
+            
+        texts = data.get('texts')
+        target_languages = data.get('target_languages') or data.get('target_language')
+        if isinstance(target_languages, str):
+            target_languages = [target_languages]
+        source_language = (data.get('source_language') or 'auto').strip()
+        stream = bool(data.get('stream', False))
+        
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': 'Texts must be a non-empty list'}), 400
+        if len(texts) > BATCH_MAX_TEXTS:
+            return jsonify({'error': f'Too many texts (max {BATCH_MAX_TEXTS})'}), 400
+        if not all(isinstance(text, str) for text in texts):
+            return jsonify({'error': 'Every text must be a string'}), 400
+        if not isinstance(target_languages, list) or not target_languages:
+            return jsonify({'error': 'Target languages are required'}), 400
+        if not all(isinstance(lang, str) for lang in target_languages):
+            return jsonify({'error': 'Every target language must be a string'}), 400
+            
+        texts = [text.strip() for text in texts]
+        # Accept ISO codes ('es') as well as names ('spanish'), like /api/translate does
+        target_languages = [lang.strip().lower() for lang in target_languages]
+        target_languages = list(dict.fromkeys(LANGUAGE_NAMES.get(lang, lang) for lang in target_languages))
+        invalid = [lang for lang in target_languages if lang not in LANGUAGE_CODES]
+        if invalid:
+            return jsonify({'error': f'Invalid target language(s): {", ".join(invalid)}. '
+                                     f'Supported: {", ".join(LANGUAGE_CODES)}'}), 400
+        
+        # Dedupe so repeated strings cost one translation per target language
+        positions = {}
+        for index, text in enumerate(texts):
+            for target_language in target_languages:
+                positions.setdefault((text, target_language), []).append(index)
+        
+        if stream:
+            def generate():
+                for (text, target_language), translated_text in translate_many(positions, source_language):
+                    for index in positions[(text, target_language)]:
+                        yield json.dumps({
+                            'index': index,
+                            'original_text': text,
+                            'target_language': target_language,
+                            'translated_text': translated_text
+                        }, ensure_ascii=False) + '\n'
+                yield json.dumps({'done': True, 'count': len(texts)}) + '\n'
+            return Response(generate(), mimetype='application/x-ndjson')
+        
+        translations = dict(translate_many(positions, source_language))
+        results = [{
+            'index': index,
+            'original_text': text,
+            'translations': {lang: translations[(text, lang)] for lang in target_languages}
+        } for index, text in enumerate(texts)]
+        
+        return jsonify({
+            'results': results,
+            'source_language': source_language,
+            'target_languages': target_languages,
+            'count': len(texts),
+            'unique_translations': len(positions),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Batch translation API error: {e}")
+        return jsonify({'error': 'Translation service error'}), 500
+
 @app.route('/api/rooms', methods=['GET'])
 def get_rooms():
     """Get list of active chat rooms"""
     try:
         room_list = []
-        for room_name in set(user['room'] for user in users.values()):
-            room_users = [users[uid]['username'] for uid in users if users[uid]['room'] == room_name]
+        for room_name in set(user.room for user in users.values()):
+            room_users = [user.username for user in users.values() if user.room == room_name]
             room_list.append({
                 'name': room_name,
                 'user_count': len(room_users),
@@ -161,7 +1123,7 @@ def get_messages(room):
     """Get recent messages for a room"""
     try:
         limit = request.args.get('limit', 50, type=int)
-        room_messages = [msg for msg in messages if msg['room'] == room][-limit:]
+        room_messages = [msg.to_dict() for msg in messages if msg.room == room][-limit:]
         return jsonify({
             'room': room,
             'messages': room_messages,
@@ -172,12 +1134,8 @@ def get_messages(room):
         return jsonify({'error': 'Internal server error'}), 500
 
 def check_ollama_service():
-    """Check if Ollama service is available"""
-    try:
-        response = requests.get(OLLAMA_URL.replace('/api/generate', '/api/tags'), timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    """Check if any translation backend is available"""
+    return translation_backend.is_available()
 
 # REST API endpoints for TestSprite testing
 @app.route('/api/join_chat', methods=['POST'])
@@ -334,6 +1292,111 @@ def translate():
     """TestSprite compatibility endpoint for translation - TC006"""
     return api_translate()
 
+@app.route('/translate/batch', methods=['POST'])
+def translate_batch():
+    """TestSprite compatibility endpoint for batch translation"""
+    return api_translate_batch()
+
+def encode_message(message, content, target_language, is_own, compact):
+    """Build a receive_message payload for one recipient.
+
+    The compact form uses short keys, ISO language codes and an epoch
+    timestamp, omits false flags and leaves out the recipient's own
+    target language; static/script.js decodes both forms.
+    """
+    is_translated = message.language != target_language
+    if not compact:
+        return {
+            'id': message.id,
+            'username': message.username,
+            'content': content,
+            'timestamp': message.timestamp,
+            'is_translated': is_translated,
+            'is_own': is_own,
+            'original_language': message.language,
+            'target_language': target_language
+        }
+    payload = {
+        'i': message.id,
+        'u': message.username,
+        'c': content,
+        't': int(message.created),
+        'l': LANGUAGE_CODES.get(message.language, message.language)
+    }
+    if is_translated:
+        payload['x'] = 1
+    if is_own:
+        payload['o'] = 1
+    return payload
+
+def encode_batch(payloads, compact):
+    """Wrap several message payloads into one receive_messages frame"""
+    return {'m': payloads} if compact else {'messages': payloads}
+
+# Outgoing buffers per room: room -> {uid: (compact, [payloads])}
+room_outbox = {}
+room_flush_tasks = set()
+room_flush_locks = {}
+room_outbox_lock = threading.Lock()
+coalesce_stats = {'payloads': 0, 'flushes': 0, 'frames': 0}
+
+def queue_room_message(room, uid, compact, payload):
+    """Buffer a payload for one recipient; flushed by the room's flush loop"""
+    with room_outbox_lock:
+        recipients = room_outbox.setdefault(room, {})
+        pending = recipients.setdefault(uid, (compact, []))[1]
+        pending.append(payload)
+        coalesce_stats['payloads'] += 1
+        if room not in room_flush_locks:
+            room_flush_locks[room] = threading.Lock()
+        if room not in room_flush_tasks:
+            room_flush_tasks.add(room)
+            socketio.start_background_task(room_flush_loop, room)
+        full = len(pending) >= COALESCE_MAX_BATCH
+    if full:
+        flush_room(room)
+
+def flush_room(room):
+    """Send each compact recipient everything buffered for them as a single frame.
+
+    Verbose clients only understand receive_message, so they still get one
+    event per buffered payload, delivered together at flush time. The room's
+    flush lock is held from the pop until the last emit so that a max-batch
+    flush and the flush loop cannot interleave and reorder messages.
+    """
+    with room_outbox_lock:
+        flush_lock = room_flush_locks.get(room)
+    if flush_lock is None:
+        return False
+    with flush_lock:
+        with room_outbox_lock:
+            recipients = room_outbox.pop(room, None)
+            if not recipients:
+                return False
+            coalesce_stats['flushes'] += 1
+        frames = 0
+        for uid, (compact, payloads) in recipients.items():
+            if compact and len(payloads) > 1:
+                socketio.emit('receive_messages', encode_batch(payloads, compact), to=uid)
+                frames += 1
+            else:
+                for payload in payloads:
+                    socketio.emit('receive_message', payload, to=uid)
+                frames += len(payloads)
+    with room_outbox_lock:
+        coalesce_stats['frames'] += frames
+    return True
+
+def room_flush_loop(room):
+    """Flush a room every COALESCE_MAX_DELAY_MS until it goes quiet"""
+    while True:
+        socketio.sleep(COALESCE_MAX_DELAY_MS / 1000)
+        with room_outbox_lock:
+            if room not in room_outbox:
+                room_flush_tasks.discard(room)
+                return
+        flush_room(room)
+
 @socketio.on('connect')
 def on_connect():
     print(f'User {request.sid} connected')
@@ -344,8 +1407,8 @@ def on_disconnect():
     try:
         user_id = request.sid
         if user_id in users:
-            username = users[user_id]['username']
-            room = users[user_id]['room']
+            username = users[user_id].username
+            room = users[user_id].room
             
             logger.info(f"User {username} disconnecting from room {room}")
             
@@ -360,7 +1423,7 @@ def on_disconnect():
             }, room=room)
             
             # Update user list for room
-            room_users = [users[uid]['username'] for uid in users if users[uid]['room'] == room]
+            room_users = [user.username for user in users.values() if user.room == room]
             emit('update_users', {'users': room_users}, room=room)
         
         logger.info(f'User {user_id} disconnected')
@@ -369,6 +1432,7 @@ def on_disconnect():
         logger.error(f"Error in disconnect handler: {e}")
 
 @socketio.on('join_chat')
+@tracer.trace('join_chat')
 def on_join_chat(data):
     """Handle user joining chat room - TC003"""
     try:
@@ -399,12 +1463,8 @@ def on_join_chat(data):
         username = username.replace('<', '&lt;').replace('>', '&gt;')
         
         # Store user info
-        users[user_id] = {
-            'username': username,
-            'language': language,
-            'room': room,
-            'joined_at': datetime.now().isoformat()
-        }
+        users[user_id] = User(username, language, room,
+                              compact=COMPACT_WIRE and data.get('wire_format') == 'compact')
         
         # Join room
         join_room(room)
@@ -418,24 +1478,26 @@ def on_join_chat(data):
             'timestamp': datetime.now().strftime('%H:%M:%S')
         }, room=room)
         
-        # Send existing messages to new user (last 50 messages)
-        room_messages = [msg for msg in messages if msg['room'] == room][-50:]
+        # Send existing messages to new user (last 50 messages); compact clients get one frame
+        compact = users[user_id].compact
+        room_messages = [msg for msg in messages if msg.room == room][-50:]
+        history = []
         for msg in room_messages:
             # Translate existing messages to user's language if needed
-            if msg['original_language'] != language:
-                translated_content = translate_text(msg['content'], language, msg['original_language'])
+            if msg.language != language:
+                translated_content = translate_text(msg.content, language, msg.language)
             else:
-                translated_content = msg['content']
-            
-            emit('receive_message', {
-                'username': msg['username'],
-                'content': translated_content,
-                'timestamp': msg['timestamp'],
-                'is_translated': msg['original_language'] != language
-            })
+                translated_content = msg.content
+            history.append(encode_message(msg, translated_content, language, False, compact))
+        
+        if compact and history:
+            emit('receive_messages', encode_batch(history, compact))
+        else:
+            for payload in history:
+                emit('receive_message', payload)
         
         # Update user list for room
-        room_users = [users[uid]['username'] for uid in users if users[uid]['room'] == room]
+        room_users = [user.username for user in users.values() if user.room == room]
         emit('update_users', {'users': room_users}, room=room)
         
         # Confirm successful join
@@ -450,6 +1512,7 @@ def on_join_chat(data):
         emit('error', {'message': 'Failed to join chat room'})
 
 @socketio.on('send_message')
+@tracer.trace('send_message')
 def on_send_message(data):
     """Handle message sending with translation - TC004"""
     try:
@@ -475,48 +1538,37 @@ def on_send_message(data):
         content = content.replace('<script>', '').replace('</script>', '')
         
         user_info = users[user_id]
-        username = user_info['username']
-        user_language = user_info['language']
-        room = user_info['room']
+        username = user_info.username
+        user_language = user_info.language
+        room = user_info.room
         
         # Create message object
-        message = {
-            'id': f"{user_id}_{len(messages)}",
-            'username': username,
-            'content': content,
-            'original_language': user_language,
-            'room': room,
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
-            'created_at': datetime.now().isoformat()
-        }
+        message = Message(username, content, user_language, room)
         
         # Store message
-        messages.append(message)
+        with tracer.span('store'):
+            messages.append(message)
         logger.info(f"Message from {username} in {room}: {content[:50]}...")
         
         # Send message to all users in room with translation
+        tracer.annotate(room=room, users_scanned=len(users))
         for uid, user_data in users.items():
-            if user_data['room'] == room:
-                target_language = user_data['language']
+            if user_data.room == room:
+                target_language = user_data.language
                 
                 # Translate if needed
                 if user_language != target_language:
                     translated_content = translate_text(content, target_language, user_language)
-                    is_translated = True
                 else:
                     translated_content = content
-                    is_translated = False
                 
-                emit('receive_message', {
-                    'id': message['id'],
-                    'username': username,
-                    'content': translated_content,
-                    'timestamp': message['timestamp'],
-                    'is_translated': is_translated,
-                    'is_own': uid == user_id,
-                    'original_language': user_language,
-                    'target_language': target_language
-                }, room=uid)
+                payload = encode_message(message, translated_content, target_language,
+                                         uid == user_id, user_data.compact)
+                with tracer.span('emit', to=uid, coalesced=COALESCE_MESSAGES):
+                    if COALESCE_MESSAGES:
+                        queue_room_message(room, uid, user_data.compact, payload)
+                    else:
+                        emit('receive_message', payload, room=uid)
                 
     except Exception as e:
         logger.error(f"Error in send_message: {e}")
@@ -547,10 +1599,10 @@ def on_change_language(data):
             emit('error', {'message': f'Unsupported language: {new_language}'})
             return
             
-        old_language = users[user_id]['language']
-        users[user_id]['language'] = new_language
+        old_language = users[user_id].language
+        users[user_id].language = sys.intern(new_language)
         
-        logger.info(f"User {users[user_id]['username']} changed language from {old_language} to {new_language}")
+        logger.info(f"User {users[user_id].username} changed language from {old_language} to {new_language}")
         
         emit('language_changed', {
             'language': new_language,
@@ -568,20 +1620,36 @@ if __name__ == '__main__':
         debug_mode = os.getenv('DEBUG', 'True').lower() == 'true'
         host = os.getenv('HOST', '0.0.0.0')
         port = int(os.getenv('PORT', 5000))
+        # In debug mode the werkzeug reloader runs this block in a watcher parent and in the
+        # server child; background work only belongs in the process that serves requests
+        serving_process = not debug_mode or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
         
         logger.info(f"Starting AI Chat Application on {host}:{port}")
         logger.info(f"Debug mode: {debug_mode}")
-        logger.info(f"Ollama URL: {OLLAMA_URL}")
+        logger.info(f"Translation backend: {TRANSLATION_BACKEND}")
+        logger.info(f"Ollama URLs: {', '.join(OLLAMA_URLS)} ({ROUTING_STRATEGY})")
         
         # Check Ollama service
         print("🔍 Checking Ollama connection...")
-        if test_ollama_connection():
+        if TRANSLATION_BACKEND == 'stub':
+            print("🧪 Using deterministic stub translation backend")
+        elif test_ollama_connection():
             logger.info("Ollama service is available")
             print(f"🤖 Using model: {OLLAMA_MODEL}")
+            if OLLAMA_WARMUP and serving_process:
+                print("🔥 Warming up model in the background...")
+                socketio.start_background_task(warm_up_model)
         else:
             logger.warning("Ollama service is not available - translation will return original text")
             print("⚠️  Translation service unavailable, messages will not be translated")
         
+        if TRANSLATION_PREWARM_FILE and serving_process:
+            print(f"📚 Prewarming translation cache from {TRANSLATION_PREWARM_FILE}...")
+            socketio.start_background_task(prewarm_translation_cache, TRANSLATION_PREWARM_FILE)
+        
+        if TRANSLATION_BACKEND == 'ollama' and OLLAMA_HEARTBEAT_INTERVAL > 0 and serving_process:
+            socketio.start_background_task(model_heartbeat_loop)
+        
         # Start the application
         socketio.run(
             app, 
@@ -0,0 +1,65 @@
+"""Bytes per stored message: legacy dict messages vs slotted Message records.
+
+Usage: python benchmarks/message_memory.py [count]
+"""
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import Message
+
+ROOMS = ['general', 'support', 'random', 'dev']
+LANGUAGES = ['english', 'hindi', 'spanish', 'french', 'german', 'chinese', 'japanese', 'korean']
+USERNAMES = [f'user{i}' for i in range(200)]
+
+def fresh(value):
+    """Copy a string the way each Socket.IO payload delivers a new one"""
+    return value[:1] + value[1:]
+
+def sample(i):
+    return (
+        fresh(USERNAMES[i % len(USERNAMES)]),
+        f'Message number {i} about the deployment schedule',
+        fresh(LANGUAGES[i % len(LANGUAGES)]),
+        fresh(ROOMS[i % len(ROOMS)])
+    )
+
+def legacy_message(i, storage):
+    username, content, language, room = sample(i)
+    return {
+        'id': f"Xk3v9QpLmZ7aB2cDAAAB_{len(storage)}",
+        'username': username,
+        'content': content,
+        'original_language': language,
+        'room': room,
+        'timestamp': datetime.now().strftime('%H:%M:%S'),
+        'created_at': datetime.now().isoformat()
+    }
+
+def compact_message(i, storage):
+    return Message(*sample(i))
+
+def measure(build, count):
+    """Return bytes retained per message (content strings excluded)"""
+    contents = [sample(i)[1] for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    storage = []
+    for i in range(count):
+        storage.append(build(i, storage))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    content_bytes = sum(sys.getsizeof(content) for content in contents)
+    return (after - before - content_bytes) / count
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    legacy = measure(legacy_message, count)
+    compact = measure(compact_message, count)
+    print(f"Messages stored:         {count}")
+    print(f"dict message (before):   {legacy:.0f} bytes/message")
+    print(f"Message record (after):  {compact:.0f} bytes/message")
+    print(f"Saved:                   {100 * (1 - compact / legacy):.0f}%")
@@ -0,0 +1,147 @@
+"""Routing checks and throughput for the translation backends.
+
+Starts in-process fake Ollama endpoints (answering like the real
+/api/generate, as NDJSON when asked to stream) and checks BackendRouter
+selection, ejection, retry, per-endpoint keep-warm and that only traced
+requests stream, then compares single vs batch translation throughput on
+the stub backend.
+Exits non-zero if a check fails.
+
+Usage: python benchmarks/translation_backends.py
+"""
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ['TRANSLATION_BACKEND'] = 'stub'
+os.environ.setdefault('STUB_LATENCY_MS', '5')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from app import BACKEND_EJECT_FAILURES, BackendRouter, OllamaBackend
+
+# Ejection warnings are expected here
+app.logger.setLevel(logging.ERROR)
+
+def start_fake_ollama(delay):
+    """Serve a fake /api/generate that answers after `delay` seconds; return its URL"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            text = payload['prompt'].split('Text to translate: ')[-1].split('\n')[0]
+            time.sleep(delay)
+            self.send_response(200)
+            if not payload.get('stream'):
+                body = json.dumps({'response': f'{port}:{text}', 'done': True, 'load_duration': 1000000}).encode('utf-8')
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in ({'response': f'{port}:{text}', 'done': False},
+                          {'response': '', 'done': True, 'load_duration': 1000000}):
+                line = (json.dumps(chunk) + '\n').encode('utf-8')
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+            self.wfile.write(b'0\r\n\r\n')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{port}/api/generate'
+
+def unused_url():
+    """URL of a port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f'http://127.0.0.1:{port}/api/generate'
+
+def run(router, count, concurrency=8):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda i: router.translate(f'text {i}', 'spanish', 'english'), range(count)))
+
+def check_selection(strategy, fast_url, slow_url):
+    router = BackendRouter([OllamaBackend(fast_url, 'fake'), OllamaBackend(slow_url, 'fake')], strategy=strategy)
+    results = run(router, 80)
+    assert all(result.endswith(f'text {i}') for i, result in enumerate(results)), 'translations out of order'
+    fast, slow = (stat['requests'] for stat in router.stats)
+    assert fast > slow, f'{strategy}: fast endpoint got {fast} requests, slow got {slow}'
+    print(f"{strategy:>17}: fast endpoint {fast} requests, slow endpoint {slow}")
+
+def check_ejection_and_retry(live_url):
+    router = BackendRouter([OllamaBackend(unused_url(), 'fake'), OllamaBackend(live_url, 'fake')])
+    results = [router.translate(f'text {i}', 'spanish', 'english') for i in range(20)]
+    assert all(result.endswith(f'text {i}') for i, result in enumerate(results)), 'connection failure not retried'
+    dead, live = router.stats
+    assert dead['failures'] == BACKEND_EJECT_FAILURES, f"dead endpoint tried {dead['failures']} times"
+    assert dead['ejected_until'] > time.time(), 'dead endpoint not ejected'
+    assert live['requests'] == 20
+    print(f"{'ejection':>17}: dead endpoint ejected after {dead['failures']} failures, "
+          f"all {len(results)} requests retried on the live one")
+
+def check_keep_warm(fast_url, slow_url):
+    router = BackendRouter([OllamaBackend(fast_url, 'fake'), OllamaBackend(slow_url, 'fake')])
+    assert router.warm_up() and router.is_warm(), 'warm-up did not mark endpoints warm'
+    router.stats[1]['last_used'] -= 3600
+    assert not router.is_warm(), 'idle endpoint still reported warm'
+    pinged = router.keep_warm(60)
+    assert pinged == 1, f'expected only the idle endpoint to be pinged, got {pinged}'
+    assert router.is_warm() and all(backend['warm'] for backend in router.describe()['backends'])
+    print(f"{'keep_warm':>17}: only the idle endpoint was pinged")
+
+def check_traced_streaming(url):
+    backend = OllamaBackend(url, 'fake')
+    with tempfile.TemporaryDirectory() as directory:
+        tracer = app.Tracer(os.path.join(directory, 'traces.jsonl'), enabled=True)
+        original, app.tracer = app.tracer, tracer
+        try:
+            assert backend.translate('untraced', 'spanish', 'english').endswith('untraced')
+            traced = tracer.trace('check')(lambda: backend.translate('traced', 'spanish', 'english'))
+            assert traced().endswith('traced'), 'streamed translation came back wrong'
+        finally:
+            app.tracer = original
+        with open(tracer.log_path) as f:
+            traces = [json.loads(line) for line in f]
+    assert len(traces) == 1, f'expected one trace, got {len(traces)}'
+    span = traces[0]['spans'][0]
+    assert 'ttfb_ms' in span and span['ttfb_ms'] <= span['total_ms'], f'no TTFB on the traced request: {span}'
+    print(f"{'tracing':>17}: traced request streamed (ttfb {span['ttfb_ms']} ms of {span['total_ms']} ms)")
+
+def bench_stub_batch(count=40):
+    """Compare one /api/translate call per text against a single batch call"""
+    client = app.app.test_client()
+    started = time.perf_counter()
+    for i in range(count):
+        client.post('/api/translate', json={'text': f'single {i}', 'target_language': 'spanish'})
+    single = time.perf_counter() - started
+    started = time.perf_counter()
+    client.post('/api/translate/batch', json={'texts': [f'batch {i}' for i in range(count)],
+                                              'target_languages': ['spanish']})
+    batch = time.perf_counter() - started
+    print(f"stub backend ({app.translation_backend.latency_ms} ms/call), {count} texts: "
+          f"single {single * 1000:.0f} ms, batch {batch * 1000:.0f} ms ({single / batch:.1f}x)")
+
+if __name__ == '__main__':
+    fast_url = start_fake_ollama(0.005)
+    slow_url = start_fake_ollama(0.05)
+    check_selection('least_outstanding', fast_url, slow_url)
+    check_selection('latency', fast_url, slow_url)
+    check_ejection_and_retry(fast_url)
+    check_keep_warm(fast_url, slow_url)
+    check_traced_streaming(slow_url)
+    bench_stub_batch()
@@ -0,0 +1,104 @@
+"""Checks for the persistent translation cache.
+
+Uses a temporary SQLite file and the stub backend to check that cached
+translations survive a restart, are cleared when the model changes, are
+evicted least recently used first past max_entries, and that the first
+stored translation for a key wins. Also times warm lookups.
+Exits non-zero if a check fails.
+
+Usage: python benchmarks/translation_cache.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ['TRANSLATION_BACKEND'] = 'stub'
+os.environ.pop('TRANSLATION_CACHE_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from app import PersistentTranslationCache
+
+# Model-change notices are expected here
+app.logger.setLevel(logging.ERROR)
+
+def check_restart(path):
+    cache = PersistentTranslationCache(path, 'model-a', 100)
+    cache.put('hello', 'spanish', 'english', 'hola')
+    cache.flush()
+    restarted = PersistentTranslationCache(path, 'model-a', 100)
+    assert restarted.get('hello', 'spanish', 'english') == 'hola', 'entry lost across restart'
+    assert restarted.stats()['entries'] == 1, f"restart counted {restarted.stats()['entries']} entries"
+    print(f"{'restart':>14}: entry found by a fresh cache on the same file")
+
+def check_model_change(path):
+    changed = PersistentTranslationCache(path, 'model-b', 100)
+    assert changed.get('hello', 'spanish', 'english') is None, 'entry from the old model still served'
+    assert changed.stats()['entries'] == 0, f"{changed.stats()['entries']} entries left after model change"
+    print(f"{'model change':>14}: entries cleared for the new model")
+
+def check_first_value_wins(path):
+    cache = PersistentTranslationCache(path, 'model-b', 100)
+    cache.put('bye', 'french', 'english', 'au revoir')
+    cache.flush()
+    cache.put('bye', 'french', 'english', 'salut')
+    cache.flush()
+    value = cache.get('bye', 'french', 'english')
+    assert value == 'au revoir', f'second put replaced the first value with {value!r}'
+    assert cache.stats()['entries'] == 1, f"duplicate put counted as {cache.stats()['entries']} entries"
+    print(f"{'first value':>14}: duplicate put ignored, row count unchanged")
+
+def check_lru_eviction(path, max_entries=3):
+    cache = PersistentTranslationCache(path, 'model-c', max_entries)
+    for i in range(max_entries):
+        cache.put(f'text {i}', 'german', 'english', f'text {i} (de)')
+        cache.flush()
+        time.sleep(0.01)
+    # Touch the oldest entry so the second one becomes least recently used
+    assert cache.get('text 0', 'german', 'english') == 'text 0 (de)'
+    cache.flush()
+    time.sleep(0.01)
+    cache.put('text new', 'german', 'english', 'text new (de)')
+    cache.flush()
+    assert cache.stats()['entries'] == max_entries, f"{cache.stats()['entries']} entries kept, max {max_entries}"
+    assert cache.get('text 1', 'german', 'english') is None, 'least recently used entry not evicted'
+    for text in ('text 0', 'text 2', 'text new'):
+        assert cache.get(text, 'german', 'english') == f'{text} (de)', f'{text!r} evicted'
+    print(f"{'eviction':>14}: least recently used entry evicted at {max_entries} entries")
+
+def check_failed_open(directory):
+    writers = threading.active_count()
+    cache = PersistentTranslationCache(os.path.join(directory, 'missing', 'cache.db'), 'model-a', 100)
+    try:
+        cache.get('hello', 'spanish', 'english')
+    except Exception:
+        pass
+    else:
+        raise AssertionError('open of an unreachable path succeeded')
+    assert threading.active_count() == writers, 'failed open left a writer thread running'
+    print(f"{'failed open':>14}: no writer thread left behind")
+
+def bench_lookups(path, count=2000):
+    cache = PersistentTranslationCache(path, 'model-d', count)
+    for i in range(count):
+        cache.put(f'text {i}', 'hindi', 'english', f'text {i} (hi)')
+    cache.flush()
+    started = time.perf_counter()
+    for i in range(count):
+        cache.get(f'text {i}', 'hindi', 'english')
+    elapsed = time.perf_counter() - started
+    cache.flush()
+    print(f"{count} warm lookups: {elapsed * 1e6 / count:.1f} us each")
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'translations.db')
+        check_restart(path)
+        check_model_change(path)
+        check_first_value_wins(path)
+        check_lru_eviction(path)
+        check_failed_open(directory)
+        bench_lookups(path)
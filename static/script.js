@@ -6,6 +6,18 @@ let username = '';
 let currentLanguage = '';
 let currentRoom = '';
 
+// Language names for the ISO codes used by the compact wire format
+const LANGUAGE_NAMES = {
+    en: 'english',
+    hi: 'hindi',
+    es: 'spanish',
+    fr: 'french',
+    de: 'german',
+    zh: 'chinese',
+    ja: 'japanese',
+    ko: 'korean'
+};
+
 // DOM elements
 const loginModal = document.getElementById('loginModal');
 const chatContainer = document.getElementById('chatContainer');
@@ -93,7 +105,8 @@ function joinChat(username, language, room) {
     socket.emit('join_chat', {
         username: username,
         language: language,
-        room: room
+        room: room,
+        wire_format: 'compact'
     });
     
     // Update UI
@@ -121,6 +134,28 @@ function sendMessage() {
     }, 500); // Prevent spam
 }
 
+function formatTimestamp(epochSeconds) {
+    return new Date(epochSeconds * 1000).toLocaleTimeString('en-GB', { hour12: false });
+}
+
+// Expand a compact message payload into the verbose form; verbose payloads pass through
+function decodeMessage(data) {
+    if (data.content !== undefined) {
+        return data;
+    }
+    
+    return {
+        id: data.i,
+        username: data.u,
+        content: data.c,
+        timestamp: formatTimestamp(data.t),
+        is_translated: !!data.x,
+        is_own: !!data.o,
+        original_language: LANGUAGE_NAMES[data.l] || data.l,
+        target_language: currentLanguage
+    };
+}
+
 function addMessage(data) {
     const messageDiv = document.createElement('div');
     messageDiv.className = `message ${data.is_own ? 'own' : ''}`;
@@ -241,13 +276,18 @@ socket.on('reconnect', function() {
         socket.emit('join_chat', {
             username: username,
             language: currentLanguage,
-            room: currentRoom
+            room: currentRoom,
+            wire_format: 'compact'
         });
     }
 });
 
 socket.on('receive_message', function(data) {
-    addMessage(data);
+    addMessage(decodeMessage(data));
+});
+
+socket.on('receive_messages', function(data) {
+    (data.m || data.messages || []).forEach(message => addMessage(decodeMessage(message)));
 });
 
 socket.on('user_joined', function(data) {
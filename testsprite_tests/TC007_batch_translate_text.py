@@ -0,0 +1,56 @@
+import json
+import requests
+
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 60
+HEADERS = {"Content-Type": "application/json"}
+
+def test_batch_translate_text():
+    url = f"{BASE_URL}/translate/batch"
+
+    # Test valid batch request with duplicate texts and several target languages
+    payload_valid = {
+        "texts": ["Hello", "Good morning", "Hello"],
+        "source_language": "english",
+        "target_languages": ["spanish", "french"]
+    }
+    try:
+        response = requests.post(url, json=payload_valid, headers=HEADERS, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 OK, got {response.status_code}"
+        data = response.json()
+        assert "results" in data, "Response JSON missing 'results'"
+        assert len(data["results"]) == 3, "Expected one result per input text"
+        for index, result in enumerate(data["results"]):
+            assert result["index"] == index, "Results should be returned in input order"
+            assert result["original_text"] == payload_valid["texts"][index]
+            for lang in payload_valid["target_languages"]:
+                assert isinstance(result["translations"].get(lang), str), f"Missing '{lang}' translation"
+        assert data["results"][0]["translations"] == data["results"][2]["translations"], \
+            "Duplicate texts should get identical translations"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+    # Test missing texts
+    try:
+        response = requests.post(url, json={"target_languages": ["spanish"]}, headers=HEADERS, timeout=TIMEOUT)
+        assert response.status_code >= 400, f"Expected client error for missing texts, got {response.status_code}"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+    # Test NDJSON streaming
+    payload_stream = {
+        "texts": ["Thank you", "See you later"],
+        "target_language": "german",
+        "stream": True
+    }
+    try:
+        response = requests.post(url, json=payload_stream, headers=HEADERS, timeout=TIMEOUT, stream=True)
+        assert response.status_code == 200, f"Expected 200 OK for streaming, got {response.status_code}"
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+        assert lines[-1].get("done") is True, "Stream should end with a 'done' record"
+        indices = sorted(line["index"] for line in lines[:-1])
+        assert indices == [0, 1], f"Expected one streamed result per text, got {indices}"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+test_batch_translate_text()